@@ -0,0 +1,77 @@
+"""
+Response caching for AI Tutor Orchestrator
+Memoizes orchestration results for repeated conversation requests
+"""
+
+import hashlib
+import threading
+import orjson
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+from models import ConversationRequest
+from orchestrator import HISTORY_WINDOW
+
+SIGNATURE_DIGEST_SIZE = 16
+
+def conversation_signature(conversation_request: ConversationRequest) -> bytes:
+    """
+    Build a cache key covering every input that shapes an orchestration result.
+    
+    Recent history is only ever read lowercased during extraction, so it is compared
+    case-insensitively; the current message is kept verbatim since its casing
+    survives into the fallback topic. The inputs are hashed down to a fixed-size
+    digest so cached keys never hold the (unbounded) request text.
+    
+    Args:
+        conversation_request: The conversation data to key
+    
+    Returns:
+        16-byte digest of the request's signature
+    """
+    user_info = conversation_request.user_info
+    signature = (
+        conversation_request.current_message,
+        [msg.content_lower for msg in conversation_request.chat_history[-HISTORY_WINDOW:]],
+        user_info.learning_style_summary,
+        user_info.emotional_state_summary,
+        user_info.mastery_level_summary
+    )
+    return hashlib.blake2b(orjson.dumps(signature), digest_size=SIGNATURE_DIGEST_SIZE).digest()
+
+class ResponseCache:
+    """Thread-safe LRU cache of orchestration results"""
+    
+    __slots__ = ("maxsize", "_entries", "_lock")
+    
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None, marking it as recently used."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+    
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry when full."""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> int:
+        """Drop every entry; returns how many were removed."""
+        with self._lock:
+            cleared = len(self._entries)
+            self._entries.clear()
+            return cleared
+    
+    def __len__(self) -> int:
+        return len(self._entries)
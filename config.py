@@ -2,16 +2,71 @@
 Configuration management for AI Tutor Orchestrator
 """
 
+import functools
+import itertools
 import os
-from typing import Dict, Any
+import re
+import sys
+from types import MappingProxyType
+from typing import Dict, Any, FrozenSet, List, Mapping, Iterable, Iterator, Optional, Pattern, Sequence, Tuple
 
-# Try to load environment variables, but don't fail if dotenv is not available
-try:
-    from dotenv import load_dotenv
+@functools.lru_cache(maxsize=1)
+def _load_env() -> bool:
+    """Load environment variables from .env once; returns whether dotenv was available."""
+    # Try to load environment variables, but don't fail if dotenv is not available
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        # dotenv not available, continue without it
+        return False
     load_dotenv()
-except ImportError:
-    # dotenv not available, continue without it
-    pass
+    return True
+
+_load_env()
+
+
+def _compile_keywords(keywords: Iterable[str]) -> Pattern[str]:
+    """
+    Compile a keyword list into a single alternation pattern over lowercased text.
+    
+    Keywords only match as whole words (optionally pluralised with a trailing "s"),
+    so "math" no longer matches inside "aftermath". Longer keywords are tried
+    first so the longest keyword wins at any position.
+    """
+    ordered = sorted(set(keywords), key=len, reverse=True)
+    alternation = "|".join(re.escape(keyword) for keyword in ordered)
+    return re.compile(rf"\b({alternation})s?\b")
+
+def _intern_all(words: Iterable[str]) -> FrozenSet[str]:
+    """Intern keyword strings so equal keywords share a single object."""
+    return frozenset(sys.intern(word) for word in words)
+
+def _intern_mapping(mapping: Mapping[str, str]) -> Mapping[str, str]:
+    """Intern a string mapping's keys and values and return a read-only view of it."""
+    return MappingProxyType({sys.intern(key): sys.intern(value) for key, value in mapping.items()})
+
+def _index_keywords(categories: Mapping[str, Iterable[str]]) -> Dict[str, Tuple[str, ...]]:
+    """Map each keyword to every category it belongs to."""
+    index: Dict[str, Tuple[str, ...]] = {}
+    for category, keywords in categories.items():
+        for keyword in keywords:
+            index[keyword] = index.get(keyword, ()) + (category,)
+    return index
+
+# Marks the end of a keyword phrase inside a word trie node
+_TRIE_END = "$"
+
+def _build_word_trie(keywords: Iterable[str], subject_mapping: Mapping[str, str],
+                     aliases: Mapping[str, str]) -> Dict[str, Any]:
+    """Build a nested-dict trie over keyword phrases (and their aliases), keyed word by word."""
+    trie: Dict[str, Any] = {}
+    phrases = [(keyword, keyword) for keyword in keywords] + list(aliases.items())
+    for phrase, keyword in phrases:
+        node = trie
+        for word in phrase.split():
+            node = node.setdefault(sys.intern(word), {})
+        node[_TRIE_END] = (keyword, subject_mapping.get(keyword))
+    return trie
 
 class Config:
     """Application configuration"""
@@ -25,6 +80,16 @@ class Config:
     HOST = os.getenv("HOST", "0.0.0.0")
     PORT = int(os.getenv("PORT", 8000))
     DEBUG = os.getenv("DEBUG", "False").lower() == "true"
+    WORKERS = int(os.getenv("WORKERS", 1))
+    # uvloop has no Windows build, so fall back to the stdlib loop there
+    UVICORN_LOOP = os.getenv("UVICORN_LOOP", "asyncio" if sys.platform == "win32" else "uvloop")
+    UVICORN_HTTP = os.getenv("UVICORN_HTTP", "httptools")
+    ACCESS_LOG = os.getenv("ACCESS_LOG", "False").lower() == "true"
+    # Worker threads available to blocking work run off the event loop
+    THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", 100))
+    # Parameter extraction is a few microseconds of string work today; only move
+    # it off the event loop if a heavier (e.g. model-backed) extractor is plugged in
+    EXTRACT_IN_THREAD = os.getenv("EXTRACT_IN_THREAD", "False").lower() == "true"
     
     # Logging Configuration
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
@@ -35,25 +100,47 @@ class Config:
     CORS_METHODS = ["*"]
     CORS_HEADERS = ["*"]
     
+    # Compression Configuration
+    GZIP_MINIMUM_SIZE = int(os.getenv("GZIP_MINIMUM_SIZE", 1024))
+    GZIP_COMPRESS_LEVEL = int(os.getenv("GZIP_COMPRESS_LEVEL", 4))
+    
+    # Caching Configuration
+    RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", 1024))
+    ANALYSIS_CACHE_SIZE = int(os.getenv("ANALYSIS_CACHE_SIZE", 2048))
+    # Message plus history characters above which an analysis is not memoized
+    ANALYSIS_CACHE_MAX_CHARS = int(os.getenv("ANALYSIS_CACHE_MAX_CHARS", 4096))
+    TOOL_CACHE_SIZE = int(os.getenv("TOOL_CACHE_SIZE", 1024))
+    PROFILE_CACHE_SIZE = int(os.getenv("PROFILE_CACHE_SIZE", 256))
+    # The invalidation endpoint is unauthenticated, so it is only served when
+    # explicitly enabled (on by default in debug mode)
+    CACHE_INVALIDATION_ENABLED = os.getenv("CACHE_INVALIDATION_ENABLED", str(DEBUG)).lower() == "true"
+    
     # Educational Tools Configuration
     MAX_FLASHCARD_COUNT = 20
     MIN_FLASHCARD_COUNT = 1
-    SUPPORTED_NOTE_STYLES = ["outline", "bullet_points", "narrative", "structured"]
-    SUPPORTED_DIFFICULTIES = ["easy", "medium", "hard"]
-    SUPPORTED_DEPTHS = ["basic", "intermediate", "advanced", "comprehensive"]
+    # Smaller flashcard sets are sent buffered; at about 200 bytes a card, this
+    # keeps streamed responses above GZIP_MINIMUM_SIZE, since GZip compresses
+    # every streamed response regardless of size
+    STREAM_MIN_FLASHCARDS = int(os.getenv("STREAM_MIN_FLASHCARDS", 5))
+    SUPPORTED_NOTE_STYLES_ORDERED = ("outline", "bullet_points", "narrative", "structured")
+    SUPPORTED_DIFFICULTIES_ORDERED = ("easy", "medium", "hard")
+    SUPPORTED_DEPTHS_ORDERED = ("basic", "intermediate", "advanced", "comprehensive")
+    SUPPORTED_NOTE_STYLES = frozenset(SUPPORTED_NOTE_STYLES_ORDERED)
+    SUPPORTED_DIFFICULTIES = frozenset(SUPPORTED_DIFFICULTIES_ORDERED)
+    SUPPORTED_DEPTHS = frozenset(SUPPORTED_DEPTHS_ORDERED)
     
     # Parameter Extraction Configuration
     MAX_CHAT_HISTORY = 10
-    TOPIC_EXTRACTION_KEYWORDS = [
+    TOPIC_EXTRACTION_KEYWORDS = (
         "math", "calculus", "algebra", "geometry", "statistics",
         "science", "biology", "chemistry", "physics", "environmental",
         "history", "literature", "english", "writing", "reading",
         "programming", "computer science", "coding", "photosynthesis",
         "derivatives", "equations", "world war"
-    ]
+    )
     
     # Subject Mapping
-    SUBJECT_MAPPING = {
+    SUBJECT_MAPPING = _intern_mapping({
         "math": "Mathematics",
         "calculus": "Mathematics", 
         "algebra": "Mathematics",
@@ -68,50 +155,163 @@ class Config:
         "english": "English",
         "literature": "English",
         "programming": "Computer Science",
+        "computer science": "Computer Science",
         "coding": "Computer Science"
-    }
+    })
+    
+    # Keywords match whole words (plus a trailing "s"), so other word forms a
+    # student is likely to use are listed alongside their stems
     
     # Tool Selection Keywords
-    NOTE_MAKER_KEYWORDS = ["note", "notes", "summary", "outline", "study guide"]
-    FLASHCARD_KEYWORDS = ["flashcard", "quiz", "test", "practice", "review", "memorize"]
-    EXPLAINER_KEYWORDS = ["explain", "understand", "concept", "how", "what", "why", "confused"]
+    NOTE_MAKER_KEYWORDS = frozenset({"note", "notes", "summary", "outline", "study guide"})
+    FLASHCARD_KEYWORDS = frozenset({
+        "flashcard", "quiz", "quizzes", "test", "testing", "practice", "practicing",
+        "review", "reviewing", "memorize", "memorizing"
+    })
+    EXPLAINER_KEYWORDS = frozenset({
+        "explain", "explaining", "explanation", "understand", "understanding",
+        "concept", "how", "what", "why", "confused"
+    })
     
     # Difficulty Inference
-    EASY_KEYWORDS = ["struggling", "difficult", "hard", "confused", "beginner"]
-    HARD_KEYWORDS = ["advanced", "expert", "challenging", "complex"]
+    EASY_KEYWORDS = frozenset({"struggling", "difficult", "difficulty", "difficulties", "hard", "confused", "beginner"})
+    HARD_KEYWORDS = frozenset({"advanced", "expert", "challenging", "complex", "complexity"})
     
     # Depth Inference
-    BASIC_KEYWORDS = ["basic", "simple", "beginner", "confused", "fundamental"]
-    ADVANCED_KEYWORDS = ["advanced", "comprehensive", "detailed", "expert"]
+    BASIC_KEYWORDS = frozenset({"basic", "simple", "beginner", "confused", "fundamental"})
+    ADVANCED_KEYWORDS = frozenset({"advanced", "comprehensive", "detailed", "expert"})
+    
+    # Flashcard Count Inference
+    FEW_COUNT_KEYWORDS = frozenset({"few", "some", "little"})
+    MANY_COUNT_KEYWORDS = frozenset({"many", "lot", "comprehensive", "extensive"})
+    
+    # Keyword categories scanned in a single pass per message
+    # (topics and subjects are found through TOPIC_TRIE instead)
+    KEYWORD_CATEGORIES = {
+        "note_maker": _intern_all(NOTE_MAKER_KEYWORDS),
+        "flashcard_generator": _intern_all(FLASHCARD_KEYWORDS),
+        "concept_explainer": _intern_all(EXPLAINER_KEYWORDS),
+        "easy": _intern_all(EASY_KEYWORDS),
+        "hard": _intern_all(HARD_KEYWORDS),
+        "basic": _intern_all(BASIC_KEYWORDS),
+        "advanced": _intern_all(ADVANCED_KEYWORDS),
+        "few": _intern_all(FEW_COUNT_KEYWORDS),
+        "many": _intern_all(MANY_COUNT_KEYWORDS)
+    }
+    KEYWORD_INDEX = _index_keywords(KEYWORD_CATEGORIES)
+    KEYWORD_PATTERN = _compile_keywords(KEYWORD_INDEX)
+    
+    # Word forms that name a topic keyword without containing it as a word
+    TOPIC_ALIASES = MappingProxyType({
+        "mathematics": "math"
+    })
+    
+    # Word trie over topic keywords and subject keys (deduplicated) for longest-match lookup
+    TOPIC_TRIE = _build_word_trie(
+        dict.fromkeys([*TOPIC_EXTRACTION_KEYWORDS, *SUBJECT_MAPPING]), SUBJECT_MAPPING, TOPIC_ALIASES
+    )
+    
+    @classmethod
+    def _iter_topics(cls, tokens: Sequence[str]) -> Iterator[Tuple[str, Optional[str]]]:
+        """Yield the longest trie match starting at each token position."""
+        for start in range(len(tokens)):
+            node = cls.TOPIC_TRIE
+            hit = None
+            # islice walks forward in place instead of copying the remaining tokens
+            for word in itertools.islice(tokens, start, None):
+                child = node.get(word)
+                # Accept a trailing plural "s", as Config.scan does ("maths", "sciences")
+                if child is None and word.endswith("s"):
+                    child = node.get(word[:-1])
+                node = child
+                if node is None:
+                    break
+                hit = node.get(_TRIE_END, hit)
+            if hit is not None:
+                yield hit
+    
+    @classmethod
+    def lookup_topic(cls, tokens: Sequence[str]) -> Optional[Tuple[str, Optional[str]]]:
+        """
+        Find the first topic mentioned in a tokenized text.
+        
+        Args:
+            tokens: Lowercased words of the text, in order
+            
+        Returns:
+            Tuple of (keyword, subject or None) for the earliest, longest match, or None
+        """
+        return next(cls._iter_topics(tokens), None)
+    
+    @classmethod
+    def lookup_subject(cls, tokens: Sequence[str]) -> Optional[str]:
+        """Find the subject of the first mapped topic in a tokenized text."""
+        return next((subject for _, subject in cls._iter_topics(tokens) if subject), None)
+    
+    @classmethod
+    def scan(cls, text: str) -> Dict[str, List[str]]:
+        """
+        Scan text for every keyword category in a single pass.
+        
+        Args:
+            text: Text to analyze
+            
+        Returns:
+            Mapping of category name to matched keywords, in order of appearance
+        """
+        matches: Dict[str, List[str]] = {}
+        # Lowercase before matching so every match is a key of the index; a
+        # case-insensitive pattern also matches Unicode case variants ("ſ" for "s")
+        for keyword in cls.KEYWORD_PATTERN.findall(text.lower()):
+            for category in cls.KEYWORD_INDEX[keyword]:
+                matches.setdefault(category, []).append(keyword)
+        return matches
     
     @classmethod
-    def get_config(cls) -> Dict[str, Any]:
-        """Get complete configuration as dictionary."""
-        return {
-            "api": {
+    @functools.lru_cache(maxsize=1)
+    def get_config(cls) -> Mapping[str, Any]:
+        """Get complete configuration as a read-only mapping (at every level), built once."""
+        return MappingProxyType({
+            "api": MappingProxyType({
                 "title": cls.API_TITLE,
                 "description": cls.API_DESCRIPTION,
                 "version": cls.API_VERSION
-            },
-            "server": {
+            }),
+            "server": MappingProxyType({
                 "host": cls.HOST,
                 "port": cls.PORT,
-                "debug": cls.DEBUG
-            },
-            "logging": {
+                "debug": cls.DEBUG,
+                "workers": cls.WORKERS,
+                "threadpool_size": cls.THREADPOOL_SIZE,
+                "extract_in_thread": cls.EXTRACT_IN_THREAD
+            }),
+            "logging": MappingProxyType({
                 "level": cls.LOG_LEVEL
-            },
-            "cors": {
-                "origins": cls.CORS_ORIGINS,
+            }),
+            "cors": MappingProxyType({
+                "origins": tuple(cls.CORS_ORIGINS),
                 "credentials": cls.CORS_CREDENTIALS,
-                "methods": cls.CORS_METHODS,
-                "headers": cls.CORS_HEADERS
-            },
-            "tools": {
+                "methods": tuple(cls.CORS_METHODS),
+                "headers": tuple(cls.CORS_HEADERS)
+            }),
+            "compression": MappingProxyType({
+                "gzip_minimum_size": cls.GZIP_MINIMUM_SIZE,
+                "gzip_compress_level": cls.GZIP_COMPRESS_LEVEL
+            }),
+            "cache": MappingProxyType({
+                "response_cache_size": cls.RESPONSE_CACHE_SIZE,
+                "analysis_cache_size": cls.ANALYSIS_CACHE_SIZE,
+                "analysis_cache_max_chars": cls.ANALYSIS_CACHE_MAX_CHARS,
+                "tool_cache_size": cls.TOOL_CACHE_SIZE,
+                "profile_cache_size": cls.PROFILE_CACHE_SIZE,
+                "invalidation_enabled": cls.CACHE_INVALIDATION_ENABLED
+            }),
+            "tools": MappingProxyType({
                 "max_flashcard_count": cls.MAX_FLASHCARD_COUNT,
                 "min_flashcard_count": cls.MIN_FLASHCARD_COUNT,
-                "supported_note_styles": cls.SUPPORTED_NOTE_STYLES,
-                "supported_difficulties": cls.SUPPORTED_DIFFICULTIES,
-                "supported_depths": cls.SUPPORTED_DEPTHS
-            }
-        }
+                "stream_min_flashcards": cls.STREAM_MIN_FLASHCARDS,
+                "supported_note_styles": cls.SUPPORTED_NOTE_STYLES_ORDERED,
+                "supported_difficulties": cls.SUPPORTED_DIFFICULTIES_ORDERED,
+                "supported_depths": cls.SUPPORTED_DEPTHS_ORDERED
+            })
+        })
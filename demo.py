@@ -3,18 +3,89 @@ Demo script for AI Tutor Orchestrator
 This script demonstrates the system's capabilities with realistic scenarios.
 """
 
-import requests
-import json
+import contextlib
+import functools
+import io
+import ijson
+import orjson
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # API base URL
 BASE_URL = "http://localhost:8000"
 
+@functools.lru_cache(maxsize=1)
+def get_session():
+    """Shared session so every demo request reuses a pooled keep-alive connection."""
+    # requests is imported on first use to keep module import cheap
+    import requests
+    from requests.adapters import HTTPAdapter
+    
+    session = requests.Session()
+    session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+    return session
+
+def parse_json(response):
+    """Decode a JSON response body with orjson."""
+    return orjson.loads(response.content)
+
+# ijson events that carry a scalar value, and those that start an array item
+_SCALAR_EVENTS = frozenset({"string", "number", "boolean", "null"})
+_ITEM_START_EVENTS = _SCALAR_EVENTS | {"start_map", "start_array"}
+
+def stream_json_fields(response, fields, counted=()):
+    """
+    Stream-parse a JSON response, keeping only selected values.
+    
+    Args:
+        response: Response opened with stream=True
+        fields: Dotted prefixes of scalar values to keep
+        counted: Dotted prefixes of arrays whose items are only counted
+        
+    Returns:
+        Dict of prefix -> value, plus "<prefix>.count" for each counted array
+    """
+    response.raw.decode_content = True
+    result = {f"{prefix}.count": 0 for prefix in counted}
+    item_counters = {f"{prefix}.item": f"{prefix}.count" for prefix in counted}
+    for prefix, event, value in ijson.parse(response.raw):
+        if prefix in item_counters and event in _ITEM_START_EVENTS:
+            result[item_counters[prefix]] += 1
+        elif prefix in fields and event in _SCALAR_EVENTS:
+            result[prefix] = value
+    return result
+
+class ThreadBufferedStdout:
+    """Stdout proxy that buffers output per thread so concurrent demos print in order."""
+    
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+    
+    def write(self, text):
+        return getattr(self._local, "buffer", self._stream).write(text)
+    
+    def flush(self):
+        self._stream.flush()
+    
+    def capture(self, func):
+        """Run func and return everything it printed."""
+        self._local.buffer = io.StringIO()
+        try:
+            func()
+            return self._local.buffer.getvalue()
+        finally:
+            del self._local.buffer
+
 def test_health():
     """Test if the API is running."""
+    import requests
+    
     try:
-        response = requests.get(f"{BASE_URL}/")
-        print("✅ API Health Check:", response.json())
+        response = get_session().get(f"{BASE_URL}/")
+        print("✅ API Health Check:", parse_json(response))
         return True
     except requests.exceptions.ConnectionError:
         print("❌ API is not running. Please start the server with: python main.py")
@@ -42,8 +113,8 @@ def demo_note_making():
     }
     
     try:
-        response = requests.post(f"{BASE_URL}/api/orchestrate", json=request_data)
-        result = response.json()
+        response = get_session().post(f"{BASE_URL}/api/orchestrate", json=request_data)
+        result = parse_json(response)
         
         if result["success"]:
             print(f"✅ Tool Selected: {result['tool_name']}")
@@ -80,8 +151,8 @@ def demo_flashcard_generation():
     }
     
     try:
-        response = requests.post(f"{BASE_URL}/api/orchestrate", json=request_data)
-        result = response.json()
+        response = get_session().post(f"{BASE_URL}/api/orchestrate", json=request_data)
+        result = parse_json(response)
         
         if result["success"]:
             print(f"✅ Tool Selected: {result['tool_name']}")
@@ -124,8 +195,8 @@ def demo_concept_explanation():
     }
     
     try:
-        response = requests.post(f"{BASE_URL}/api/orchestrate", json=request_data)
-        result = response.json()
+        response = get_session().post(f"{BASE_URL}/api/orchestrate", json=request_data)
+        result = parse_json(response)
         
         if result["success"]:
             print(f"✅ Tool Selected: {result['tool_name']}")
@@ -166,13 +237,18 @@ def demo_direct_tool_calling():
     }
     
     try:
-        response = requests.post(f"{BASE_URL}/api/tools/flashcard_generator", json=tool_request)
-        result = response.json()
+        # Only a few fields are printed, so stream them instead of decoding every card
+        with get_session().post(f"{BASE_URL}/api/tools/flashcard_generator", json=tool_request, stream=True) as response:
+            result = stream_json_fields(
+                response,
+                fields=("success", "tool_name", "response_data.topic", "error_message"),
+                counted=("response_data.flashcards",)
+            )
         
         if result["success"]:
             print(f"✅ Direct Tool Call Successful: {result['tool_name']}")
-            print(f"📚 Topic: {result['response_data']['topic']}")
-            print(f"📊 Generated {len(result['response_data']['flashcards'])} flashcards")
+            print(f"📚 Topic: {result['response_data.topic']}")
+            print(f"📊 Generated {result['response_data.flashcards.count']} flashcards")
         else:
             print(f"❌ Error: {result['error_message']}")
             
@@ -185,8 +261,8 @@ def list_available_tools():
     print("=" * 50)
     
     try:
-        response = requests.get(f"{BASE_URL}/api/tools")
-        tools = response.json()
+        response = get_session().get(f"{BASE_URL}/api/tools")
+        tools = parse_json(response)
         
         print("Available Educational Tools:")
         for tool in tools["available_tools"]:
@@ -212,12 +288,14 @@ def main():
     if not test_health():
         return
     
-    # Run demos
+    # Run demos; the independent requests run concurrently, output stays in order
     list_available_tools()
-    demo_note_making()
-    demo_flashcard_generation()
-    demo_concept_explanation()
-    demo_direct_tool_calling()
+    demos = [demo_note_making, demo_flashcard_generation, demo_concept_explanation, demo_direct_tool_calling]
+    stdout = ThreadBufferedStdout(sys.stdout)
+    with contextlib.redirect_stdout(stdout), ThreadPoolExecutor(max_workers=len(demos)) as executor:
+        outputs = list(executor.map(stdout.capture, demos))
+    for output in outputs:
+        print(output, end="")
     
     print("\n✅ Demo completed successfully!")
     print("\n💡 Key Features Demonstrated:")
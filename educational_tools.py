@@ -3,8 +3,14 @@ Educational Tools Implementation
 Mock implementations of the three educational tools
 """
 
+import functools
 import logging
-from typing import Dict, Any, List
+import orjson
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Any, Callable, Iterator, Mapping, Optional, Tuple, Union
+from pydantic import BaseModel, TypeAdapter
+from config import Config
 from models import (
     NoteMakerRequest, NoteMakerResponse, NoteSection,
     FlashcardGeneratorRequest, FlashcardGeneratorResponse, Flashcard,
@@ -13,199 +19,395 @@ from models import (
 
 logger = logging.getLogger(__name__)
 
+# Validators for incoming tool parameters, built once at import
+_NOTE_MAKER_ADAPTER = TypeAdapter(NoteMakerRequest)
+_FLASHCARD_GENERATOR_ADAPTER = TypeAdapter(FlashcardGeneratorRequest)
+_CONCEPT_EXPLAINER_ADAPTER = TypeAdapter(ConceptExplainerRequest)
+
+# Tool outputs are pure functions of their primitive inputs, so rendered
+# responses are memoized as read-only structures: mappingproxy and tuples all
+# the way down, so a caller cannot alter what the next caller receives. Callers
+# receive a shallow dict copy to add top-level fields to; encode the result with
+# orjson and default=dict, which writes tuples as arrays.
+
+@dataclass(frozen=True)
+class NoteSectionTemplate:
+    """Note section skeleton with {topic}/{subject} placeholders"""
+    title: str
+    content: str
+    key_points: Tuple[str, ...]
+    examples: Tuple[str, ...]
+    analogies: Tuple[str, ...]
+    
+    def render(self, topic: str, subject: str, include_examples: bool, include_analogies: bool) -> Mapping[str, Any]:
+        """Fill in the template for a topic and subject, as a read-only mapping."""
+        return MappingProxyType({
+            "title": self.title.format(topic=topic, subject=subject),
+            "content": self.content.format(topic=topic, subject=subject),
+            "key_points": tuple(point.format(topic=topic) for point in self.key_points),
+            "examples": tuple(example.format(topic=topic) for example in self.examples) if include_examples else (),
+            "analogies": tuple(analogy.format(topic=topic) for analogy in self.analogies) if include_analogies else ()
+        })
+
+# Section templates per note-taking style; narrative and outline share the default
+_NOTE_TEMPLATES = {
+    "structured": (
+        NoteSectionTemplate(
+            title="Introduction",
+            content="Introduction to {topic} in {subject}",
+            key_points=("Key concept 1 of {topic}", "Key concept 2 of {topic}"),
+            examples=("Example 1: {topic} in practice", "Example 2: {topic} application"),
+            analogies=("Think of {topic} like...",)
+        ),
+        NoteSectionTemplate(
+            title="Main Concepts",
+            content="Core concepts of {topic}",
+            key_points=("Concept A: {topic} fundamentals", "Concept B: {topic} applications"),
+            examples=("Real-world example of {topic}",),
+            analogies=("{topic} is similar to...",)
+        )
+    ),
+    "bullet_points": (
+        NoteSectionTemplate(
+            title="{topic} Overview",
+            content="Key points about {topic}",
+            key_points=("• Point 1: {topic} basics", "• Point 2: {topic} importance"),
+            examples=("• Example: {topic} in action",),
+            analogies=("• Analogy: {topic} is like...",)
+        ),
+    )
+}
+_DEFAULT_NOTE_TEMPLATE = (
+    NoteSectionTemplate(
+        title="Understanding {topic}",
+        content="A comprehensive look at {topic} in {subject}",
+        key_points=("Main idea: {topic} fundamentals", "Application: {topic} in practice"),
+        examples=("Example: {topic} case study",),
+        analogies=("Analogy: {topic} comparison",)
+    ),
+)
+
+# Flashcard titles for every allowed count, sliced per request
+_FLASHCARD_TITLES = tuple(f"Question {i}" for i in range(1, Config.MAX_FLASHCARD_COUNT + 1))
+
+# (question, answer, example) templates per flashcard difficulty
+_FLASHCARD_TEMPLATES = {
+    "easy": (
+        "What is the basic concept of {topic}?",
+        "The basic concept of {topic} is fundamental understanding.",
+        "Example: {topic} in simple terms"
+    ),
+    "medium": (
+        "What are the key principles of {topic}?",
+        "The key principles of {topic} include core concepts and practical applications.",
+        "Example: {topic} in practice"
+    ),
+    "hard": (
+        "Explain the advanced applications of {topic} in {subject}.",
+        "Advanced applications of {topic} include complex scenarios and real-world implementations.",
+        "Advanced example: {topic} in professional context"
+    )
+}
+
+# Explanation, example and practice question templates per explanation depth
+_DEPTH_TEMPLATES = {
+    "basic": {
+        "explanation": "This is a basic explanation of {concept}. It covers the fundamental principles in simple terms.",
+        "examples": ("Simple example: {concept} in everyday life", "Basic example: {concept} fundamentals"),
+        "practice_questions": ("What is {concept}?", "How does {concept} work?")
+    },
+    "intermediate": {
+        "explanation": "This is an intermediate explanation of {concept}. It covers the main principles and practical applications.",
+        "examples": ("Example 1: {concept} in practice", "Example 2: {concept} applications"),
+        "practice_questions": ("How does {concept} work?", "What are the applications of {concept}?")
+    },
+    "advanced": {
+        "explanation": "This is an advanced explanation of {concept}. It covers complex principles, applications, and theoretical foundations.",
+        "examples": ("Advanced example: {concept} in professional context", "Complex example: {concept} in research"),
+        "practice_questions": ("Analyze the implications of {concept}", "Evaluate the applications of {concept}")
+    },
+    "comprehensive": {
+        "explanation": "This is a comprehensive explanation of {concept}. It covers all aspects from basic principles to advanced applications and real-world implications.",
+        "examples": ("Basic example: {concept} fundamentals", "Advanced example: {concept} in practice", "Real-world example: {concept} applications"),
+        "practice_questions": ("Explain {concept} from multiple perspectives", "Compare {concept} with related concepts")
+    }
+}
+
+def note_maker(parameters: Union[Dict[str, Any], NoteMakerRequest]) -> Dict[str, Any]:
+    """
+    Generate structured notes based on topic and learning style.
+    
+    Args:
+        parameters: Tool parameters including user_info, topic, subject, etc.; a NoteMakerRequest is used as-is
+    
+    Returns:
+        Generated notes in structured format
+    
+    Raises:
+        ValidationError: If parameters do not match NoteMakerRequest
+    """
+    request = _NOTE_MAKER_ADAPTER.validate_python(parameters)
+    topic = request.topic
+    subject = request.subject
+    note_style = request.note_taking_style
+    include_examples = request.include_examples
+    include_analogies = request.include_analogies
+    
+    logger.info("Generating notes for topic: %s, style: %s", topic, note_style)
+    
+    return dict(_render_notes(
+        topic, subject, note_style, include_examples, include_analogies
+    ))
+
+@functools.lru_cache(maxsize=Config.TOOL_CACHE_SIZE)
+def _render_notes(topic: str, subject: str, note_style: str,
+                  include_examples: bool, include_analogies: bool) -> Mapping[str, Any]:
+    """Render the note maker response for a given set of parameters."""
+    # Create note sections based on style
+    templates = _NOTE_TEMPLATES.get(note_style, _DEFAULT_NOTE_TEMPLATE)
+    sections = tuple(
+        template.render(topic, subject, include_examples, include_analogies)
+        for template in templates
+    )
+    
+    return MappingProxyType({
+        "topic": topic,
+        "title": f"Notes on {topic}",
+        "summary": f"Comprehensive notes covering {topic} with examples and key concepts.",
+        "note_sections": sections,
+        "key_concepts": (f"Concept 1: {topic} basics", f"Concept 2: {topic} applications", f"Concept 3: {topic} importance"),
+        "connections_to_prior_learning": (f"Builds on previous {subject} knowledge", f"Connects to {topic} fundamentals"),
+        "visual_elements": (MappingProxyType({"type": "diagram", "description": f"{topic} process flow"}),),
+        "practice_suggestions": (f"Practice exercise 1: {topic} basics", f"Practice exercise 2: {topic} application"),
+        "source_references": (f"Reference 1: {topic} textbook", f"Reference 2: {topic} online resources"),
+        "note_taking_style": note_style
+    })
+
+def flashcard_generator(parameters: Union[Dict[str, Any], FlashcardGeneratorRequest]) -> Dict[str, Any]:
+    """
+    Generate practice flashcards with adaptive difficulty.
+    
+    Args:
+        parameters: Tool parameters including user_info, topic, count, difficulty, etc.; a FlashcardGeneratorRequest is used as-is
+    
+    Returns:
+        Generated flashcards in structured format
+    
+    Raises:
+        ValidationError: If parameters do not match FlashcardGeneratorRequest
+    """
+    request = _FLASHCARD_GENERATOR_ADAPTER.validate_python(parameters)
+    topic = request.topic
+    count = request.count
+    difficulty = request.difficulty
+    subject = request.subject
+    include_examples = request.include_examples
+    
+    logger.info("Generating %s flashcards for topic: %s, difficulty: %s", count, topic, difficulty)
+    
+    return dict(_render_flashcards(
+        topic, count, difficulty, subject, include_examples
+    ))
+
+def flashcard_generator_stream(parameters: Union[Dict[str, Any], FlashcardGeneratorRequest]) -> Iterator[bytes]:
+    """
+    Generate practice flashcards as JSON, encoding each card as it is produced.
+    
+    Args:
+        parameters: Tool parameters including user_info, topic, count, difficulty, etc.; a FlashcardGeneratorRequest is used as-is
+    
+    Returns:
+        Iterator over chunks of the JSON-encoded response data
+    
+    Raises:
+        ValidationError: If parameters do not match FlashcardGeneratorRequest (before any output)
+    """
+    request = _FLASHCARD_GENERATOR_ADAPTER.validate_python(parameters)
+    
+    logger.info("Streaming %s flashcards for topic: %s, difficulty: %s", request.count, request.topic, request.difficulty)
+    
+    return _stream_flashcards(
+        request.topic, request.count, request.difficulty, request.subject, request.include_examples
+    )
+
+def _flashcard_text(topic: str, difficulty: str, subject: str,
+                    include_examples: bool) -> Tuple[str, str, Optional[str]]:
+    """Render the (question, answer, example) text shared by every card."""
+    question_template, answer_template, example_template = _FLASHCARD_TEMPLATES.get(
+        difficulty, _FLASHCARD_TEMPLATES["medium"]
+    )
+    question = question_template.format(topic=topic, subject=subject)
+    answer = answer_template.format(topic=topic, subject=subject)
+    example = example_template.format(topic=topic, subject=subject) if include_examples else None
+    return question, answer, example
+
+def _flashcard_summary(topic: str, difficulty: str) -> Dict[str, str]:
+    """Build the response fields that follow the flashcards."""
+    return {
+        "topic": topic,
+        "adaptation_details": f"Adapted for {difficulty} difficulty level based on student profile",
+        "difficulty": difficulty
+    }
+
+@functools.lru_cache(maxsize=Config.TOOL_CACHE_SIZE)
+def _render_flashcards(topic: str, count: int, difficulty: str,
+                       subject: str, include_examples: bool) -> Mapping[str, Any]:
+    """Render the flashcard generator response for a given set of parameters."""
+    # Render the card text once; every card shares the same strings
+    question, answer, example = _flashcard_text(topic, difficulty, subject, include_examples)
+    
+    flashcards = tuple(
+        MappingProxyType({"title": title, "question": question, "answer": answer, "example": example})
+        for title in _FLASHCARD_TITLES[:count]
+    )
+    
+    return MappingProxyType({"flashcards": flashcards, **_flashcard_summary(topic, difficulty)})
+
+def _stream_flashcards(topic: str, count: int, difficulty: str,
+                       subject: str, include_examples: bool) -> Iterator[bytes]:
+    """Encode the flashcard generator response card by card, without building the list."""
+    question, answer, example = _flashcard_text(topic, difficulty, subject, include_examples)
+    # Everything after a card's title is identical, so it is encoded once
+    card_tail = orjson.dumps({"question": question, "answer": answer, "example": example})[1:]
+    
+    yield b'{"flashcards":['
+    for i, title in enumerate(_FLASHCARD_TITLES[:count]):
+        yield b'%s{"title":%s,%s' % (b"," if i else b"", orjson.dumps(title), card_tail)
+    yield b"]," + orjson.dumps(_flashcard_summary(topic, difficulty))[1:]
+
+def concept_explainer(parameters: Union[Dict[str, Any], ConceptExplainerRequest]) -> Dict[str, Any]:
+    """
+    Provide detailed concept explanations with examples and visual aids.
+    
+    Args:
+        parameters: Tool parameters including user_info, concept_to_explain, etc.; a ConceptExplainerRequest is used as-is
+    
+    Returns:
+        Detailed explanation with examples and learning aids
+    
+    Raises:
+        ValidationError: If parameters do not match ConceptExplainerRequest
+    """
+    request = _CONCEPT_EXPLAINER_ADAPTER.validate_python(parameters)
+    concept = request.concept_to_explain
+    topic = request.current_topic
+    depth = request.desired_depth
+    
+    logger.info("Explaining concept: %s, depth: %s", concept, depth)
+    
+    return dict(_render_explanation(concept, topic, depth))
+
+@functools.lru_cache(maxsize=Config.TOOL_CACHE_SIZE)
+def _render_explanation(concept: str, topic: str, depth: str) -> Mapping[str, Any]:
+    """Render the concept explainer response for a given set of parameters."""
+    # Generate explanation based on depth
+    templates = _DEPTH_TEMPLATES.get(depth, _DEPTH_TEMPLATES["intermediate"])
+    explanation = templates["explanation"].format(concept=concept)
+    examples = tuple(template.format(concept=concept) for template in templates["examples"])
+    practice_questions = tuple(template.format(concept=concept) for template in templates["practice_questions"])
+    
+    return MappingProxyType({
+        "explanation": explanation,
+        "examples": examples,
+        "related_concepts": (f"Related concept 1 to {concept}", f"Related concept 2 to {concept}"),
+        "visual_aids": (f"Diagram: {concept} process flow", f"Chart: {concept} relationships"),
+        "practice_questions": practice_questions,
+        "source_references": (f"Reference 1: {concept} textbook", f"Reference 2: {concept} online resources")
+    })
+
+# Tool name -> implementation, resolved with a single dict lookup
+_TOOLS = {
+    "note_maker": note_maker,
+    "flashcard_generator": flashcard_generator,
+    "concept_explainer": concept_explainer
+}
+_SUPPORTED_TOOLS: Tuple[str, ...] = tuple(_TOOLS)
+
+def _flashcards_worth_streaming(parameters: Union[Dict[str, Any], FlashcardGeneratorRequest]) -> bool:
+    """Whether a flashcard request asks for enough cards to be worth streaming."""
+    if isinstance(parameters, FlashcardGeneratorRequest):
+        count = parameters.count
+    else:
+        count = parameters.get("count")
+    return isinstance(count, int) and count >= Config.STREAM_MIN_FLASHCARDS
+
+# Tools that can also encode their response incrementally as JSON bytes, each
+# with a check for whether a request is large enough to be worth streaming
+_STREAMING_TOOLS = {
+    "flashcard_generator": (flashcard_generator_stream, _flashcards_worth_streaming)
+}
+
 class EducationalTools:
     """Collection of educational tools with mock implementations"""
     
-    @staticmethod
-    def note_maker(parameters: Dict[str, Any]) -> Dict[str, Any]:
+    note_maker = staticmethod(note_maker)
+    flashcard_generator = staticmethod(flashcard_generator)
+    concept_explainer = staticmethod(concept_explainer)
+    flashcard_generator_stream = staticmethod(flashcard_generator_stream)
+    
+    @classmethod
+    def call_tool(cls, tool_name: str, parameters: Union[Dict[str, Any], BaseModel]) -> Dict[str, Any]:
         """
-        Generate structured notes based on topic and learning style.
+        Call the specified educational tool.
         
         Args:
-            parameters: Tool parameters including user_info, topic, subject, etc.
+            tool_name: Name of the tool to call
+            parameters: Tool-specific parameters, as a dict or a tool request model
             
         Returns:
-            Generated notes in structured format
-        """
-        topic = parameters.get("topic", "General Topic")
-        subject = parameters.get("subject", "General Education")
-        note_style = parameters.get("note_taking_style", "outline")
-        include_examples = parameters.get("include_examples", True)
-        include_analogies = parameters.get("include_analogies", False)
-        
-        logger.info(f"Generating notes for topic: {topic}, style: {note_style}")
-        
-        # Create note sections based on style
-        sections = []
-        if note_style == "structured":
-            sections = [
-                {
-                    "title": "Introduction",
-                    "content": f"Introduction to {topic} in {subject}",
-                    "key_points": [f"Key concept 1 of {topic}", f"Key concept 2 of {topic}"],
-                    "examples": [f"Example 1: {topic} in practice", f"Example 2: {topic} application"] if include_examples else [],
-                    "analogies": [f"Think of {topic} like..."] if include_analogies else []
-                },
-                {
-                    "title": "Main Concepts",
-                    "content": f"Core concepts of {topic}",
-                    "key_points": [f"Concept A: {topic} fundamentals", f"Concept B: {topic} applications"],
-                    "examples": [f"Real-world example of {topic}"] if include_examples else [],
-                    "analogies": [f"{topic} is similar to..."] if include_analogies else []
-                }
-            ]
-        elif note_style == "bullet_points":
-            sections = [
-                {
-                    "title": f"{topic} Overview",
-                    "content": f"Key points about {topic}",
-                    "key_points": [f"• Point 1: {topic} basics", f"• Point 2: {topic} importance"],
-                    "examples": [f"• Example: {topic} in action"] if include_examples else [],
-                    "analogies": [f"• Analogy: {topic} is like..."] if include_analogies else []
-                }
-            ]
-        else:  # narrative or outline
-            sections = [
-                {
-                    "title": f"Understanding {topic}",
-                    "content": f"A comprehensive look at {topic} in {subject}",
-                    "key_points": [f"Main idea: {topic} fundamentals", f"Application: {topic} in practice"],
-                    "examples": [f"Example: {topic} case study"] if include_examples else [],
-                    "analogies": [f"Analogy: {topic} comparison"] if include_analogies else []
-                }
-            ]
-        
-        return {
-            "topic": topic,
-            "title": f"Notes on {topic}",
-            "summary": f"Comprehensive notes covering {topic} with examples and key concepts.",
-            "note_sections": sections,
-            "key_concepts": [f"Concept 1: {topic} basics", f"Concept 2: {topic} applications", f"Concept 3: {topic} importance"],
-            "connections_to_prior_learning": [f"Builds on previous {subject} knowledge", f"Connects to {topic} fundamentals"],
-            "visual_elements": [{"type": "diagram", "description": f"{topic} process flow"}],
-            "practice_suggestions": [f"Practice exercise 1: {topic} basics", f"Practice exercise 2: {topic} application"],
-            "source_references": [f"Reference 1: {topic} textbook", f"Reference 2: {topic} online resources"],
-            "note_taking_style": note_style
-        }
-    
-    @staticmethod
-    def flashcard_generator(parameters: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Generate practice flashcards with adaptive difficulty.
-        
-        Args:
-            parameters: Tool parameters including user_info, topic, count, difficulty, etc.
+            Tool response data
             
-        Returns:
-            Generated flashcards in structured format
+        Raises:
+            ValueError: If tool_name is not supported
         """
-        topic = parameters.get("topic", "General Topic")
-        count = parameters.get("count", 5)
-        difficulty = parameters.get("difficulty", "medium")
-        subject = parameters.get("subject", "General Education")
-        include_examples = parameters.get("include_examples", True)
-        
-        logger.info(f"Generating {count} flashcards for topic: {topic}, difficulty: {difficulty}")
-        
-        # Generate flashcards based on difficulty
-        flashcards = []
-        for i in range(count):
-            if difficulty == "easy":
-                question = f"What is the basic concept of {topic}?"
-                answer = f"The basic concept of {topic} is fundamental understanding."
-                example = f"Example: {topic} in simple terms" if include_examples else None
-            elif difficulty == "hard":
-                question = f"Explain the advanced applications of {topic} in {subject}."
-                answer = f"Advanced applications of {topic} include complex scenarios and real-world implementations."
-                example = f"Advanced example: {topic} in professional context" if include_examples else None
-            else:  # medium
-                question = f"What are the key principles of {topic}?"
-                answer = f"The key principles of {topic} include core concepts and practical applications."
-                example = f"Example: {topic} in practice" if include_examples else None
-            
-            flashcards.append({
-                "title": f"Question {i+1}",
-                "question": question,
-                "answer": answer,
-                "example": example
-            })
-        
-        return {
-            "flashcards": flashcards,
-            "topic": topic,
-            "adaptation_details": f"Adapted for {difficulty} difficulty level based on student profile",
-            "difficulty": difficulty
-        }
-    
-    @staticmethod
-    def concept_explainer(parameters: Dict[str, Any]) -> Dict[str, Any]:
+        tool = _TOOLS.get(tool_name)
+        if tool is None:
+            raise ValueError(f"Unknown tool: {tool_name}")
+        return tool(parameters)
+    
+    @classmethod
+    def get_tool(cls, tool_name: str) -> Optional[Callable[[Any], Dict[str, Any]]]:
         """
-        Provide detailed concept explanations with examples and visual aids.
+        Look up a tool implementation by name.
         
         Args:
-            parameters: Tool parameters including user_info, concept_to_explain, etc.
+            tool_name: Name of the tool
             
         Returns:
-            Detailed explanation with examples and learning aids
+            The tool function, or None if tool_name is not supported
         """
-        concept = parameters.get("concept_to_explain", "General Concept")
-        topic = parameters.get("current_topic", "General Topic")
-        depth = parameters.get("desired_depth", "intermediate")
-        
-        logger.info(f"Explaining concept: {concept}, depth: {depth}")
-        
-        # Generate explanation based on depth
-        if depth == "basic":
-            explanation = f"This is a basic explanation of {concept}. It covers the fundamental principles in simple terms."
-            examples = [f"Simple example: {concept} in everyday life", f"Basic example: {concept} fundamentals"]
-            practice_questions = [f"What is {concept}?", f"How does {concept} work?"]
-        elif depth == "advanced":
-            explanation = f"This is an advanced explanation of {concept}. It covers complex principles, applications, and theoretical foundations."
-            examples = [f"Advanced example: {concept} in professional context", f"Complex example: {concept} in research"]
-            practice_questions = [f"Analyze the implications of {concept}", f"Evaluate the applications of {concept}"]
-        elif depth == "comprehensive":
-            explanation = f"This is a comprehensive explanation of {concept}. It covers all aspects from basic principles to advanced applications and real-world implications."
-            examples = [f"Basic example: {concept} fundamentals", f"Advanced example: {concept} in practice", f"Real-world example: {concept} applications"]
-            practice_questions = [f"Explain {concept} from multiple perspectives", f"Compare {concept} with related concepts"]
-        else:  # intermediate
-            explanation = f"This is an intermediate explanation of {concept}. It covers the main principles and practical applications."
-            examples = [f"Example 1: {concept} in practice", f"Example 2: {concept} applications"]
-            practice_questions = [f"How does {concept} work?", f"What are the applications of {concept}?"]
-        
-        return {
-            "explanation": explanation,
-            "examples": examples,
-            "related_concepts": [f"Related concept 1 to {concept}", f"Related concept 2 to {concept}"],
-            "visual_aids": [f"Diagram: {concept} process flow", f"Chart: {concept} relationships"],
-            "practice_questions": practice_questions,
-            "source_references": [f"Reference 1: {concept} textbook", f"Reference 2: {concept} online resources"]
-        }
+        return _TOOLS.get(tool_name)
     
     @classmethod
-    def call_tool(cls, tool_name: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    def get_streaming_tool(cls, tool_name: str, parameters: Optional[Union[Dict[str, Any], BaseModel]] = None
+                           ) -> Optional[Callable[[Any], Iterator[bytes]]]:
         """
-        Call the specified educational tool.
+        Look up a tool that streams its response data as JSON bytes.
         
         Args:
-            tool_name: Name of the tool to call
-            parameters: Tool-specific parameters
+            tool_name: Name of the tool
+            parameters: Request parameters; if given, small requests are not streamed
             
         Returns:
-            Tool response data
-            
-        Raises:
-            ValueError: If tool_name is not supported
+            The streaming tool function, or None if tool_name has no streaming variant
+            or the request is too small to be worth streaming
         """
-        if tool_name == "note_maker":
-            return cls.note_maker(parameters)
-        elif tool_name == "flashcard_generator":
-            return cls.flashcard_generator(parameters)
-        elif tool_name == "concept_explainer":
-            return cls.concept_explainer(parameters)
-        else:
-            raise ValueError(f"Unknown tool: {tool_name}")
+        entry = _STREAMING_TOOLS.get(tool_name)
+        if entry is None:
+            return None
+        stream_tool, worth_streaming = entry
+        if parameters is not None and not worth_streaming(parameters):
+            return None
+        return stream_tool
+    
+    @classmethod
+    def get_supported_tools(cls) -> Tuple[str, ...]:
+        """Get the supported educational tools as a shared immutable tuple."""
+        return _SUPPORTED_TOOLS
     
     @classmethod
-    def get_supported_tools(cls) -> List[str]:
-        """Get list of supported educational tools."""
-        return ["note_maker", "flashcard_generator", "concept_explainer"]
+    def clear_cache(cls) -> None:
+        """Drop every memoized tool response."""
+        _render_notes.cache_clear()
+        _render_flashcards.cache_clear()
+        _render_explanation.cache_clear()
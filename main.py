@@ -3,31 +3,56 @@ Autonomous AI Tutor Orchestrator
 A robust system for intelligent parameter extraction and educational tool orchestration.
 """
 
-from fastapi import FastAPI, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+import anyio
 import logging
-from datetime import datetime
+import orjson
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Iterator
 
 # Import organized modules
 from models import ConversationRequest, ToolRequest, ToolResponse, HealthResponse, ToolListResponse
 from orchestrator import TutorOrchestrator
 from educational_tools import EducationalTools
 from config import Config
+from middleware import LeanCORSMiddleware
+from cache import ResponseCache, conversation_signature
+from utils import cached_timestamp
 
 # Configure logging
 logging.basicConfig(level=getattr(logging, Config.LOG_LEVEL))
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Size the worker thread pool before serving requests."""
+    anyio.to_thread.current_default_thread_limiter().total_tokens = Config.THREADPOOL_SIZE
+    yield
+
 # Initialize FastAPI app
 app = FastAPI(
     title=Config.API_TITLE,
     description=Config.API_DESCRIPTION,
-    version=Config.API_VERSION
+    version=Config.API_VERSION,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
+)
+
+# Compress responses worth compressing; registered before CORS so it sits inside
+# it and preflights answered by the CORS handler never reach it. GZip compresses
+# every streamed response regardless of size, so only large responses are streamed
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=Config.GZIP_MINIMUM_SIZE,
+    compresslevel=Config.GZIP_COMPRESS_LEVEL
 )
 
-# Add CORS middleware
+# Add CORS middleware (pure ASGI, skipped entirely for requests without an Origin)
 app.add_middleware(
-    CORSMiddleware,
+    LeanCORSMiddleware,
     allow_origins=Config.CORS_ORIGINS,
     allow_credentials=Config.CORS_CREDENTIALS,
     allow_methods=Config.CORS_METHODS,
@@ -37,36 +62,88 @@ app.add_middleware(
 # Initialize orchestrator
 orchestrator = TutorOrchestrator()
 
+# Orchestration results for repeated conversations
+response_cache = ResponseCache(maxsize=Config.RESPONSE_CACHE_SIZE)
+
+# Static response bodies, serialized once at startup
+TOOLS_BODY = orjson.dumps(orchestrator.get_available_tools(), default=dict)
+# Health envelope up to the opening quote of the timestamp, the only dynamic field
+HEALTH_BODY_PREFIX = orjson.dumps({
+    "message": "AI Tutor Orchestrator is running!",
+    "status": "healthy"
+})[:-1] + b',"timestamp":"'
+HEALTH_BODY_SUFFIX = b'"}'
+# Successful ToolResponse envelope; tool output holds read-only mappings, which
+# orjson encodes through default=dict
+SUCCESS_BODY_TEMPLATE = b'{"success":true,"tool_name":%s,"response_data":%s,"error_message":null}'
+# Failed ToolResponse envelope; only the tool name and message are encoded per error
+ERROR_BODY_TEMPLATE = b'{"success":false,"tool_name":%s,"response_data":{},"error_message":%s}'
+
+async def stream_tool_response(tool_name: str, chunks: Iterator[bytes]) -> AsyncIterator[bytes]:
+    """Wrap streamed response data chunks in a successful ToolResponse envelope."""
+    yield b'{"success":true,"tool_name":%s,"response_data":' % orjson.dumps(tool_name)
+    for chunk in chunks:
+        yield chunk
+    yield b',"error_message":null}'
+
+def tool_success_response(tool_name: str, response_data: Dict[str, Any]) -> Response:
+    """Encode a successful ToolResponse from the prebuilt success template."""
+    return Response(
+        SUCCESS_BODY_TEMPLATE % (orjson.dumps(tool_name), orjson.dumps(response_data, default=dict)),
+        media_type="application/json"
+    )
+
+def tool_error_response(tool_name: str, error_message: str, status_code: int = 200) -> Response:
+    """Encode a failed ToolResponse from the prebuilt error template."""
+    return Response(
+        ERROR_BODY_TEMPLATE % (orjson.dumps(tool_name), orjson.dumps(error_message)),
+        status_code=status_code,
+        media_type="application/json"
+    )
+
 # API Endpoints
-@app.get("/", response_model=HealthResponse)
-async def root():
+# Responses are built by our own code, so they are encoded directly and FastAPI
+# is told not to validate or re-serialize them (response_model=None); the models
+# are still advertised to the OpenAPI docs via `responses`.
+@app.get("/", response_model=None, responses={200: {"model": HealthResponse}})
+async def root() -> Response:
     """Health check endpoint."""
-    return HealthResponse(
-        message="AI Tutor Orchestrator is running!",
-        status="healthy",
-        timestamp=datetime.now().isoformat()
+    timestamp = cached_timestamp().encode()
+    return Response(
+        b"".join((HEALTH_BODY_PREFIX, timestamp, HEALTH_BODY_SUFFIX)),
+        media_type="application/json"
     )
 
-@app.post("/api/orchestrate", response_model=ToolResponse)
-async def orchestrate_conversation(conversation_request: ConversationRequest):
+@app.post("/api/orchestrate", response_model=None, responses={200: {"model": ToolResponse}})
+async def orchestrate_conversation(conversation_request: ConversationRequest) -> Response:
     """
     Main orchestration endpoint that processes conversation and calls appropriate educational tools.
     """
     try:
-        logger.info(f"Processing conversation for user: {conversation_request.user_info.name}")
+        logger.info("Processing conversation for user: %s", conversation_request.user_info.name)
+        
+        # Identical conversations produce identical results, so serve them from cache
+        signature = conversation_signature(conversation_request)
+        cached = response_cache.get(signature)
+        if cached is not None:
+            tool_type, response_data = cached
+            return tool_success_response(tool_type, response_data)
         
         # Extract parameters and determine tool
-        parameters, tool_type = orchestrator.extract_parameters(conversation_request)
+        if Config.EXTRACT_IN_THREAD:
+            parameters, tool_type = await run_in_threadpool(orchestrator.extract_parameters, conversation_request)
+        else:
+            parameters, tool_type = orchestrator.extract_parameters(conversation_request)
         
-        # Call the appropriate educational tool
-        response_data = EducationalTools.call_tool(tool_type, parameters)
+        # Call the appropriate educational tool; tool_type always names a known tool
+        response_data = EducationalTools.get_tool(tool_type)(parameters)
         
         # Add intelligence information to show what was detected
         intelligence_info = {
             "detected_parameters": {
-                "topic": parameters.get("topic", parameters.get("concept_to_explain", "Unknown")),
-                "subject": parameters.get("subject", parameters.get("current_topic", "Unknown")),
-                "difficulty": parameters.get("difficulty", parameters.get("desired_depth", "Unknown")),
+                "topic": getattr(parameters, "topic", getattr(parameters, "concept_to_explain", "Unknown")),
+                "subject": getattr(parameters, "subject", getattr(parameters, "current_topic", "Unknown")),
+                "difficulty": getattr(parameters, "difficulty", getattr(parameters, "desired_depth", "Unknown")),
                 "learning_style": conversation_request.user_info.learning_style_summary,
                 "emotional_state": conversation_request.user_info.emotional_state_summary,
                 "mastery_level": conversation_request.user_info.mastery_level_summary
@@ -76,53 +153,54 @@ async def orchestrate_conversation(conversation_request: ConversationRequest):
         
         # Add intelligence info to response
         response_data["intelligence_analysis"] = intelligence_info
+        response_cache.put(signature, (tool_type, response_data))
         
-        return ToolResponse(
-            success=True,
-            tool_name=tool_type,
-            response_data=response_data
-        )
+        return tool_success_response(tool_type, response_data)
         
     except Exception as e:
-        logger.error(f"Error in orchestration: {str(e)}")
-        return ToolResponse(
-            success=False,
-            tool_name="unknown",
-            response_data={},
-            error_message=str(e)
-        )
-
-@app.post("/api/tools/{tool_name}", response_model=ToolResponse)
-async def call_tool_directly(tool_name: str, tool_request: ToolRequest):
+        logger.error("Error in orchestration: %s", e)
+        return tool_error_response("unknown", str(e))
+
+@app.post("/api/tools/{tool_name}", response_model=None, responses={200: {"model": ToolResponse}, 404: {"model": ToolResponse}})
+async def call_tool_directly(tool_name: str, tool_request: ToolRequest) -> Response:
     """
     Direct tool calling endpoint for testing individual tools.
     """
+    # Unknown tools are answered directly rather than raised and caught
+    tool = EducationalTools.get_tool(tool_name)
+    if tool is None:
+        return tool_error_response(tool_name, f"Tool '{tool_name}' not found", status_code=404)
+    
     try:
-        if tool_name not in EducationalTools.get_supported_tools():
-            raise HTTPException(status_code=404, detail=f"Tool '{tool_name}' not found")
+        # Large responses from tools with a streaming variant are encoded as they
+        # are generated; parameters are validated before the first chunk is sent
+        stream_tool = EducationalTools.get_streaming_tool(tool_name, tool_request.parameters)
+        if stream_tool is not None:
+            chunks = stream_tool(tool_request.parameters)
+            return StreamingResponse(stream_tool_response(tool_name, chunks), media_type="application/json")
         
-        response_data = EducationalTools.call_tool(tool_name, tool_request.parameters)
+        response_data = tool(tool_request.parameters)
         
-        return ToolResponse(
-            success=True,
-            tool_name=tool_name,
-            response_data=response_data
-        )
+        return tool_success_response(tool_name, response_data)
         
     except Exception as e:
-        logger.error(f"Error calling tool {tool_name}: {str(e)}")
-        return ToolResponse(
-            success=False,
-            tool_name=tool_name,
-            response_data={},
-            error_message=str(e)
-        )
-
-@app.get("/api/tools", response_model=ToolListResponse)
-async def list_available_tools():
+        logger.error("Error calling tool %s: %s", tool_name, e)
+        return tool_error_response(tool_name, str(e))
+
+@app.get("/api/tools", response_model=None, responses={200: {"model": ToolListResponse}})
+async def list_available_tools() -> Response:
     """List all available educational tools."""
-    tools_info = orchestrator.get_available_tools()
-    return ToolListResponse(**tools_info)
+    return Response(TOOLS_BODY, media_type="application/json")
+
+if Config.CACHE_INVALIDATION_ENABLED:
+    @app.post("/api/cache/invalidate")
+    async def invalidate_cache():
+        """Drop cached orchestration results, analyses and tool responses, e.g. after curriculum changes."""
+        cleared = response_cache.clear()
+        orchestrator.clear_cache()
+        EducationalTools.clear_cache()
+        logger.info("Invalidated response cache (%d entries)", cleared)
+        return {"success": True, "cleared_entries": cleared}
 
 @app.get("/api/config")
 async def get_configuration():
@@ -131,4 +209,13 @@ async def get_configuration():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host=Config.HOST, port=Config.PORT)
+    # Multiple workers require an import string so each process can load the app
+    uvicorn.run(
+        "main:app" if Config.WORKERS > 1 else app,
+        host=Config.HOST,
+        port=Config.PORT,
+        loop=Config.UVICORN_LOOP,
+        http=Config.UVICORN_HTTP,
+        workers=Config.WORKERS,
+        access_log=Config.ACCESS_LOG
+    )
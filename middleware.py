@@ -0,0 +1,106 @@
+"""
+ASGI middleware for AI Tutor Orchestrator
+Lean, pure-ASGI replacements for framework middleware on the request path
+"""
+
+from typing import Iterable, List, Tuple
+
+Headers = List[Tuple[bytes, bytes]]
+
+ALL_METHODS = ("DELETE", "GET", "HEAD", "OPTIONS", "PATCH", "POST", "PUT")
+PREFLIGHT_MAX_AGE = b"600"
+
+class LeanCORSMiddleware:
+    """
+    Minimal pure-ASGI CORS handler.
+    
+    Requests without an Origin header (same-origin or non-browser clients) are
+    passed straight through. Preflight requests are answered directly, and
+    cross-origin responses get the allow headers appended to their start message.
+    """
+    
+    __slots__ = (
+        "app", "allow_all_origins", "allow_origins", "allow_credentials",
+        "allow_methods", "allow_all_headers", "allow_headers", "echo_origin"
+    )
+    
+    def __init__(self, app, allow_origins: Iterable[str] = (), allow_credentials: bool = False,
+                 allow_methods: Iterable[str] = ("GET",), allow_headers: Iterable[str] = ()):
+        self.app = app
+        allow_origins = tuple(allow_origins)
+        allow_methods = tuple(allow_methods)
+        allow_headers = tuple(allow_headers)
+        
+        self.allow_all_origins = "*" in allow_origins
+        self.allow_origins = frozenset(origin.encode("latin-1") for origin in allow_origins)
+        self.allow_credentials = allow_credentials
+        self.allow_methods = ", ".join(ALL_METHODS if "*" in allow_methods else allow_methods).encode("latin-1")
+        self.allow_all_headers = "*" in allow_headers
+        self.allow_headers = ", ".join(allow_headers).encode("latin-1")
+        # With credentials the browser rejects "*", so the request origin is echoed instead
+        self.echo_origin = allow_credentials or not self.allow_all_origins
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        origin = request_method = request_headers = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+        
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+        
+        allowed = self.allow_all_origins or origin in self.allow_origins
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            await self._preflight(origin, allowed, request_headers, send)
+            return
+        if not allowed:
+            await self.app(scope, receive, send)
+            return
+        
+        cors_headers = self._origin_headers(origin)
+        
+        async def send_with_cors(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *cors_headers]
+            await send(message)
+        
+        await self.app(scope, receive, send_with_cors)
+    
+    def _origin_headers(self, origin: bytes) -> Headers:
+        """Build the allow-origin headers for a permitted origin."""
+        if not self.echo_origin:
+            return [(b"access-control-allow-origin", b"*")]
+        headers = [(b"access-control-allow-origin", origin), (b"vary", b"Origin")]
+        if self.allow_credentials:
+            headers.append((b"access-control-allow-credentials", b"true"))
+        return headers
+    
+    async def _preflight(self, origin: bytes, allowed: bool, request_headers, send) -> None:
+        """Answer a CORS preflight request without calling the application."""
+        if allowed:
+            status, body = 200, b"OK"
+            allow_headers = request_headers if self.allow_all_headers and request_headers else self.allow_headers
+            headers = self._origin_headers(origin) + [
+                (b"access-control-allow-methods", self.allow_methods),
+                (b"access-control-max-age", PREFLIGHT_MAX_AGE)
+            ]
+            if allow_headers:
+                headers.append((b"access-control-allow-headers", allow_headers))
+        else:
+            status, body, headers = 400, b"Disallowed CORS origin", []
+        
+        headers += [
+            (b"content-type", b"text/plain; charset=utf-8"),
+            (b"content-length", str(len(body)).encode("latin-1"))
+        ]
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
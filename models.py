@@ -3,24 +3,89 @@ Pydantic models for AI Tutor Orchestrator
 Defines all data structures and validation schemas
 """
 
-from pydantic import BaseModel, Field
-from typing import List, Dict, Any, Optional
+import functools
+import re
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Dict, Any, FrozenSet, Optional
 from datetime import datetime
+from config import Config
+from utils import parse_mastery_level
+
+# Learning styles named in a profile summary, found in one scan
+_LEARNING_STYLE_RE = re.compile(r"visual|kinesthetic|auditory", re.IGNORECASE)
+
+# Learning style -> note-taking style, in order of precedence
+_NOTE_STYLE_BY_LEARNING_STYLE = (
+    ("visual", "structured"),
+    ("kinesthetic", "bullet_points"),
+    ("auditory", "narrative")
+)
+_DEFAULT_NOTE_STYLE = "outline"
+
+# Profile classifications are memoized on the summary strings rather than stored
+# on the frozen models, whose equality and hash read the instance __dict__
+@functools.lru_cache(maxsize=Config.PROFILE_CACHE_SIZE)
+def _learning_styles(learning_style_summary: str) -> FrozenSet[str]:
+    """Learning styles mentioned in a learning style summary."""
+    return frozenset(match.lower() for match in _LEARNING_STYLE_RE.findall(learning_style_summary))
+
+@functools.lru_cache(maxsize=Config.PROFILE_CACHE_SIZE)
+def _note_style(learning_style_summary: str) -> str:
+    """Note-taking style inferred from a learning style summary."""
+    styles = _learning_styles(learning_style_summary)
+    return next(
+        (note_style for style, note_style in _NOTE_STYLE_BY_LEARNING_STYLE if style in styles),
+        _DEFAULT_NOTE_STYLE
+    )
+
+@functools.lru_cache(maxsize=Config.PROFILE_CACHE_SIZE)
+def _mastery_level(mastery_level_summary: str) -> Optional[int]:
+    """Numeric level parsed from a mastery summary, or None if it has none."""
+    return parse_mastery_level(mastery_level_summary)
 
 # User Information Models
 class UserInfo(BaseModel):
     """Student profile information"""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
     user_id: str = Field(..., description="Unique identifier for the student")
     name: str = Field(..., description="Student's full name")
     grade_level: str = Field(..., description="Student's current grade level")
     learning_style_summary: str = Field(..., description="Summary of student's preferred learning style")
     emotional_state_summary: str = Field(..., description="Current emotional state of the student")
     mastery_level_summary: str = Field(..., description="Current mastery level description")
+    
+    @property
+    def learning_styles(self) -> FrozenSet[str]:
+        """Learning styles mentioned in the summary, computed once per distinct summary."""
+        return _learning_styles(self.learning_style_summary)
+    
+    @property
+    def prefers_visual(self) -> bool:
+        """Whether the student describes themselves as a visual learner."""
+        return "visual" in _learning_styles(self.learning_style_summary)
+    
+    @property
+    def note_style(self) -> str:
+        """Note-taking style inferred from the learning style."""
+        return _note_style(self.learning_style_summary)
+    
+    @property
+    def mastery_level(self) -> Optional[int]:
+        """Numeric level parsed from the mastery summary, or None if it has none."""
+        return _mastery_level(self.mastery_level_summary)
 
 class ChatMessage(BaseModel):
     """Individual chat message"""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
     role: str = Field(..., description="Role of the message sender")
     content: str = Field(..., description="Content of the message")
+    
+    @property
+    def content_lower(self) -> str:
+        """Lowercased content."""
+        return self.content.lower()
 
 # Request/Response Models
 class ConversationRequest(BaseModel):
@@ -83,6 +148,8 @@ class ConceptExplainerRequest(BaseModel):
 # Response Models for Educational Tools
 class NoteSection(BaseModel):
     """Individual note section"""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
     title: str
     content: str
     key_points: List[str]
@@ -104,6 +171,8 @@ class NoteMakerResponse(BaseModel):
 
 class Flashcard(BaseModel):
     """Individual flashcard"""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
     title: str
     question: str
     answer: str
@@ -3,60 +3,224 @@ AI Tutor Orchestrator Core Logic
 Handles intelligent parameter extraction and tool selection
 """
 
+import functools
 import logging
-from typing import Dict, Any, Tuple, List
-from models import ConversationRequest, UserInfo, ChatMessage
+import re
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Any, Callable, Final, Tuple, List, Mapping, Optional, Union
+from models import (
+    ConversationRequest, UserInfo, ChatMessage,
+    NoteMakerRequest, FlashcardGeneratorRequest, ConceptExplainerRequest
+)
+from config import Config
 
 logger = logging.getLogger(__name__)
 
+# Parameter schemas per tool; fixed at import and shared read-only
+TOOL_SCHEMAS: Final[Mapping[str, Mapping[str, Tuple[str, ...]]]] = MappingProxyType({
+    "note_maker": MappingProxyType({
+        "required": ("user_info", "chat_history", "topic", "subject", "note_taking_style"),
+        "optional": ("include_examples", "include_analogies")
+    }),
+    "flashcard_generator": MappingProxyType({
+        "required": ("user_info", "topic", "count", "difficulty", "subject"),
+        "optional": ("include_examples",)
+    }),
+    "concept_explainer": MappingProxyType({
+        "required": ("user_info", "chat_history", "concept_to_explain", "current_topic", "desired_depth"),
+        "optional": ()
+    })
+})
+_AVAILABLE_TOOLS: Mapping[str, Any] = MappingProxyType({
+    "available_tools": tuple(TOOL_SCHEMAS),
+    "tool_schemas": TOOL_SCHEMAS
+})
+
+# Typed parameters handed to the selected educational tool
+ToolParameters = Union[NoteMakerRequest, FlashcardGeneratorRequest, ConceptExplainerRequest]
+
+_WORD_RE = re.compile(r"[a-z]+")
+
+# Topic extraction looks at this many trailing chat messages, subject extraction
+# at the last SUBJECT_HISTORY_WINDOW of them
+HISTORY_WINDOW: Final = 3
+SUBJECT_HISTORY_WINDOW: Final = 2
+
+# Mastery level (1-10) -> inferred setting; other levels use the defaults
+_DIFFICULTY_BY_LEVEL = {
+    1: "easy", 2: "easy", 3: "easy",
+    4: "medium", 5: "medium", 6: "medium",
+    7: "hard", 8: "hard", 9: "hard", 10: "hard"
+}
+_DEPTH_BY_LEVEL = {
+    2: "basic", 3: "basic",
+    8: "advanced", 9: "advanced", 10: "advanced"
+}
+
+# Tool keyword categories, in the order they take precedence
+_TOOL_PRIORITY = ("note_maker", "flashcard_generator", "concept_explainer")
+
+@dataclass(frozen=True)
+class MessageAnalysis:
+    """Everything inferred from one conversation turn"""
+    __slots__ = (
+        "topic", "subject", "tool_type", "flashcard_count",
+        "difficulty", "depth", "note_style", "include_analogies"
+    )
+    topic: str
+    subject: str
+    tool_type: str
+    flashcard_count: int
+    difficulty: str
+    depth: str
+    note_style: str
+    include_analogies: bool
+
+# Tool request builders. Every value comes from the validated request or from
+# the fixed inference vocabulary, so requests are constructed without re-validation
+def _build_note_maker(user_info: UserInfo, chat_history: List[ChatMessage],
+                      analysis: MessageAnalysis) -> NoteMakerRequest:
+    """Build the note maker request from an analysis."""
+    return NoteMakerRequest.model_construct(
+        user_info=user_info,
+        chat_history=chat_history,
+        topic=analysis.topic,
+        subject=analysis.subject,
+        note_taking_style=analysis.note_style,
+        include_examples=True,
+        include_analogies=analysis.include_analogies
+    )
+
+def _build_flashcard_generator(user_info: UserInfo, chat_history: List[ChatMessage],
+                               analysis: MessageAnalysis) -> FlashcardGeneratorRequest:
+    """Build the flashcard generator request from an analysis."""
+    return FlashcardGeneratorRequest.model_construct(
+        user_info=user_info,
+        topic=analysis.topic,
+        count=analysis.flashcard_count,
+        difficulty=analysis.difficulty,
+        subject=analysis.subject,
+        include_examples=True
+    )
+
+def _build_concept_explainer(user_info: UserInfo, chat_history: List[ChatMessage],
+                             analysis: MessageAnalysis) -> ConceptExplainerRequest:
+    """Build the concept explainer request from an analysis."""
+    return ConceptExplainerRequest.model_construct(
+        user_info=user_info,
+        chat_history=chat_history,
+        concept_to_explain=analysis.topic,
+        current_topic=analysis.subject,
+        desired_depth=analysis.depth
+    )
+
+# Tool type -> request builder, resolved with a single dict lookup
+_PARAMETER_BUILDERS: Mapping[str, Callable[[UserInfo, List[ChatMessage], MessageAnalysis], ToolParameters]] = MappingProxyType({
+    "note_maker": _build_note_maker,
+    "flashcard_generator": _build_flashcard_generator,
+    "concept_explainer": _build_concept_explainer
+})
+
+# Message analysis helpers; pure functions of their arguments
+def _extract_topic(message: str, tokens: List[str]) -> str:
+    """Extract the main topic from the message and last 3 history messages' tokens."""
+    # Check for educational keywords
+    match = Config.lookup_topic(tokens)
+    if match:
+        return match[0].title()
+    
+    # Fallback to the first few words (at most three); only split off what is used
+    words = message.split(maxsplit=3)
+    return " ".join(words[:3]) if words else "General Topic"
+
+def _extract_subject(tokens: List[str]) -> str:
+    """Extract subject area from the message and last 2 history messages' tokens."""
+    subject = Config.lookup_subject(tokens)
+    if subject:
+        return subject
+    
+    return "General Education"
+
+def _determine_tool_type(message_matches: Dict[str, List[str]]) -> str:
+    """Determine which educational tool to use based on conversation."""
+    # Note-making, then flashcard/practice, then explanation keywords
+    for tool_type in _TOOL_PRIORITY:
+        if tool_type in message_matches:
+            return tool_type
+    return "concept_explainer"  # Default fallback
+
+def _infer_flashcard_count(message_matches: Dict[str, List[str]]) -> int:
+    """Infer number of flashcards needed."""
+    if "few" in message_matches:
+        return 5
+    elif "many" in message_matches:
+        return 15
+    else:
+        return 10  # Default
+
+def _infer_difficulty(level: Optional[int], message_matches: Dict[str, List[str]]) -> str:
+    """Infer difficulty level from mastery and message context."""
+    # Message-based inference
+    if "easy" in message_matches:
+        return "easy"
+    elif "hard" in message_matches:
+        return "hard"
+    
+    # Mastery level-based inference
+    else:
+        return _DIFFICULTY_BY_LEVEL.get(level, "medium")
+
+def _infer_depth(level: Optional[int], message_matches: Dict[str, List[str]]) -> str:
+    """Infer explanation depth from mastery level and message."""
+    # Message-based inference
+    if "basic" in message_matches:
+        return "basic"
+    elif "advanced" in message_matches:
+        return "comprehensive"
+    
+    # Mastery level-based inference
+    else:
+        return _DEPTH_BY_LEVEL.get(level, "intermediate")
+
+# Shared by every orchestrator instance; keyed only on the analysis inputs
+@functools.lru_cache(maxsize=Config.ANALYSIS_CACHE_SIZE)
+def _analyze_text(current_message: str, older_lower: str, recent_lower: str, note_style: str,
+                  prefers_visual: bool, mastery_level: Optional[int]) -> MessageAnalysis:
+    """Analyze the conversation inputs; memoized, as the result depends on nothing else."""
+    # Lowercase the message once and share it with every helper
+    message_lower = current_message.lower()
+    
+    # Tokenize each text once; topic and subject detection read overlapping
+    # windows of the same tokens
+    message_tokens = _WORD_RE.findall(message_lower)
+    recent_tokens = _WORD_RE.findall(recent_lower)
+    topic_tokens = message_tokens + _WORD_RE.findall(older_lower) + recent_tokens
+    subject_tokens = message_tokens + recent_tokens
+    
+    # Scan the current message once for every keyword category
+    message_matches = Config.scan(current_message)
+    
+    return MessageAnalysis(
+        topic=_extract_topic(current_message, topic_tokens),
+        subject=_extract_subject(subject_tokens),
+        tool_type=_determine_tool_type(message_matches),
+        flashcard_count=_infer_flashcard_count(message_matches),
+        difficulty=_infer_difficulty(mastery_level, message_matches),
+        depth=_infer_depth(mastery_level, message_matches),
+        note_style=note_style,
+        include_analogies=prefers_visual
+    )
+
 class TutorOrchestrator:
     """Core orchestration logic for intelligent parameter extraction and tool selection"""
     
+    __slots__ = ("tool_schemas",)
+    
     def __init__(self):
-        self.tool_schemas = {
-            "note_maker": {
-                "required": ["user_info", "chat_history", "topic", "subject", "note_taking_style"],
-                "optional": ["include_examples", "include_analogies"]
-            },
-            "flashcard_generator": {
-                "required": ["user_info", "topic", "count", "difficulty", "subject"],
-                "optional": ["include_examples"]
-            },
-            "concept_explainer": {
-                "required": ["user_info", "chat_history", "concept_to_explain", "current_topic", "desired_depth"],
-                "optional": []
-            }
-        }
-        
-        # Educational keywords for topic detection
-        self.educational_keywords = [
-            "math", "calculus", "algebra", "geometry", "statistics",
-            "science", "biology", "chemistry", "physics", "environmental",
-            "history", "literature", "english", "writing", "reading",
-            "programming", "computer science", "coding", "photosynthesis",
-            "derivatives", "equations", "world war", "photosynthesis"
-        ]
-        
-        # Subject mapping for classification
-        self.subject_mapping = {
-            "math": "Mathematics",
-            "calculus": "Mathematics", 
-            "algebra": "Mathematics",
-            "geometry": "Mathematics",
-            "statistics": "Mathematics",
-            "science": "Science",
-            "biology": "Biology",
-            "chemistry": "Chemistry",
-            "physics": "Physics",
-            "environmental": "Environmental Science",
-            "history": "History",
-            "english": "English",
-            "literature": "English",
-            "programming": "Computer Science",
-            "coding": "Computer Science"
-        }
+        self.tool_schemas = TOOL_SCHEMAS
     
-    def extract_parameters(self, conversation_request: ConversationRequest) -> Tuple[Dict[str, Any], str]:
+    def extract_parameters(self, conversation_request: ConversationRequest) -> Tuple[ToolParameters, str]:
         """
         Extract parameters from conversation context using intelligent inference.
         
@@ -64,172 +228,62 @@ class TutorOrchestrator:
             conversation_request: The conversation data to process
             
         Returns:
-            Tuple of (extracted_parameters, tool_type)
+            Tuple of (tool request model holding the extracted parameters, tool_type)
         """
         user_info = conversation_request.user_info
         chat_history = conversation_request.chat_history
-        current_message = conversation_request.current_message
-        
-        logger.info(f"Extracting parameters for user: {user_info.name}")
-        
-        # Initialize base parameters
-        extracted = {
-            "user_info": user_info.dict(),
-            "chat_history": [msg.dict() for msg in chat_history]
-        }
         
-        # Extract topic and subject from conversation
-        topic = self._extract_topic(current_message, chat_history)
-        subject = self._extract_subject(current_message, chat_history)
+        logger.info("Extracting parameters for user: %s", user_info.name)
         
-        # Determine tool type based on conversation context
-        tool_type = self._determine_tool_type(current_message)
+        analysis = self._analyze(conversation_request)
+        tool_type = analysis.tool_type
         
-        # Add tool-specific parameters
-        if tool_type == "note_maker":
-            extracted.update({
-                "topic": topic,
-                "subject": subject,
-                "note_taking_style": self._infer_note_style(user_info.learning_style_summary),
-                "include_examples": True,
-                "include_analogies": "visual" in user_info.learning_style_summary.lower()
-            })
-        elif tool_type == "flashcard_generator":
-            extracted.update({
-                "topic": topic,
-                "subject": subject,
-                "count": self._infer_flashcard_count(current_message),
-                "difficulty": self._infer_difficulty(user_info.mastery_level_summary, current_message),
-                "include_examples": True
-            })
-        elif tool_type == "concept_explainer":
-            extracted.update({
-                "concept_to_explain": topic,
-                "current_topic": subject,
-                "desired_depth": self._infer_depth(user_info.mastery_level_summary, current_message)
-            })
+        extracted = _PARAMETER_BUILDERS[tool_type](user_info, chat_history, analysis)
         
-        logger.info(f"Extracted parameters for tool: {tool_type}")
+        logger.info("Extracted parameters for tool: %s", tool_type)
         return extracted, tool_type
     
-    def _extract_topic(self, message: str, chat_history: List[ChatMessage]) -> str:
-        """Extract the main topic from conversation."""
-        # Combine current message with recent chat history
-        full_text = message.lower()
-        for msg in chat_history[-3:]:  # Look at last 3 messages
-            full_text += " " + msg.content.lower()
-        
-        # Check for educational keywords
-        for keyword in self.educational_keywords:
-            if keyword in full_text:
-                return keyword.title()
-        
-        # Fallback to first few words
-        words = message.split()
-        if len(words) >= 3:
-            return " ".join(words[:3])
-        return "General Topic"
-    
-    def _extract_subject(self, message: str, chat_history: List[ChatMessage]) -> str:
-        """Extract subject area from conversation."""
-        full_text = message.lower()
-        for msg in chat_history[-2:]:  # Look at last 2 messages
-            full_text += " " + msg.content.lower()
-        
-        for keyword, subject in self.subject_mapping.items():
-            if keyword in full_text:
-                return subject
-        
-        return "General Education"
-    
-    def _determine_tool_type(self, message: str) -> str:
-        """Determine which educational tool to use based on conversation."""
-        message_lower = message.lower()
-        
-        # Note-making keywords
-        if any(word in message_lower for word in ["note", "notes", "summary", "outline", "study guide"]):
-            return "note_maker"
-        
-        # Flashcard/practice keywords
-        elif any(word in message_lower for word in ["flashcard", "quiz", "test", "practice", "review", "memorize"]):
-            return "flashcard_generator"
-        
-        # Explanation keywords
-        elif any(word in message_lower for word in ["explain", "understand", "concept", "how", "what", "why", "confused"]):
-            return "concept_explainer"
+    def _analyze(self, conversation_request: ConversationRequest) -> MessageAnalysis:
+        """
+        Derive every extraction decision from a single scan of the current message.
         
-        else:
-            return "concept_explainer"  # Default fallback
-    
-    def _infer_note_style(self, learning_style: str) -> str:
-        """Infer note-taking style from learning style."""
-        style_lower = learning_style.lower()
+        Args:
+            conversation_request: The conversation data to process
+            
+        Returns:
+            MessageAnalysis with the topic, subject, tool choice and inferred settings
+        """
+        user_info = conversation_request.user_info
+        history = conversation_request.chat_history
         
-        if "visual" in style_lower:
-            return "structured"
-        elif "kinesthetic" in style_lower:
-            return "bullet_points"
-        elif "auditory" in style_lower:
-            return "narrative"
-        else:
-            return "outline"
-    
-    def _infer_flashcard_count(self, message: str) -> int:
-        """Infer number of flashcards needed."""
-        message_lower = message.lower()
+        # Join and lowercase each history window in a single pass. The subject
+        # window (last 2 messages) is the tail of the topic window (last 3), so
+        # only the message before it is kept apart
+        recent_lower = " ".join(msg.content for msg in history[-SUBJECT_HISTORY_WINDOW:]).lower()
+        older_lower = " ".join(msg.content for msg in history[-HISTORY_WINDOW:-SUBJECT_HISTORY_WINDOW]).lower()
         
-        if any(word in message_lower for word in ["few", "some", "little"]):
-            return 5
-        elif any(word in message_lower for word in ["many", "lot", "comprehensive", "extensive"]):
-            return 15
-        else:
-            return 10  # Default
-    
-    def _infer_difficulty(self, mastery_level: str, message: str) -> str:
-        """Infer difficulty level from mastery and message context."""
-        message_lower = message.lower()
-        mastery_lower = mastery_level.lower()
+        current_message = conversation_request.current_message
         
-        # Message-based inference
-        if any(word in message_lower for word in ["struggling", "difficult", "hard", "confused"]):
-            return "easy"
-        elif any(word in message_lower for word in ["advanced", "expert", "challenging"]):
-            return "hard"
+        # The cache keys on the full texts, so oversized inputs are analyzed
+        # without memoizing rather than held in the cache
+        analyze = _analyze_text
+        if len(current_message) + len(older_lower) + len(recent_lower) > Config.ANALYSIS_CACHE_MAX_CHARS:
+            analyze = _analyze_text.__wrapped__
         
-        # Mastery level-based inference
-        elif "level 7" in mastery_lower or "level 8" in mastery_lower or "level 9" in mastery_lower:
-            return "hard"
-        elif "level 4" in mastery_lower or "level 5" in mastery_lower or "level 6" in mastery_lower:
-            return "medium"
-        elif "level 1" in mastery_lower or "level 2" in mastery_lower or "level 3" in mastery_lower:
-            return "easy"
-        else:
-            return "medium"
+        # Profile classifications are memoized per distinct summary string in models.py
+        return analyze(
+            current_message,
+            older_lower,
+            recent_lower,
+            user_info.note_style,
+            user_info.prefers_visual,
+            user_info.mastery_level
+        )
     
-    def _infer_depth(self, mastery_level: str, message: str) -> str:
-        """Infer explanation depth from mastery level and message."""
-        message_lower = message.lower()
-        mastery_lower = mastery_level.lower()
-        
-        # Message-based inference
-        if any(word in message_lower for word in ["basic", "simple", "beginner", "confused"]):
-            return "basic"
-        elif any(word in message_lower for word in ["advanced", "comprehensive", "detailed"]):
-            return "comprehensive"
-        
-        # Mastery level-based inference
-        elif "level 8" in mastery_lower or "level 9" in mastery_lower or "level 10" in mastery_lower:
-            return "advanced"
-        elif "level 2" in mastery_lower or "level 3" in mastery_lower:
-            return "basic"
-        elif "level 6" in mastery_lower or "level 7" in mastery_lower:
-            return "intermediate"
-        else:
-            return "intermediate"
+    def clear_cache(self) -> None:
+        """Drop every memoized conversation analysis (the cache is module-wide)."""
+        _analyze_text.cache_clear()
     
-    def get_available_tools(self) -> Dict[str, Any]:
-        """Get list of available tools and their schemas."""
-        return {
-            "available_tools": list(self.tool_schemas.keys()),
-            "tool_schemas": self.tool_schemas
-        }
+    def get_available_tools(self) -> Mapping[str, Any]:
+        """Get list of available tools and their schemas (shared, read-only)."""
+        return _AVAILABLE_TOOLS
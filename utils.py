@@ -2,12 +2,33 @@
 Utility functions for AI Tutor Orchestrator
 """
 
+import functools
 import logging
-from typing import Dict, Any, List
+import re
+import time
+from typing import Dict, Any, List, Optional, Pattern, Tuple
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# How long a formatted timestamp is reused before it is regenerated
+TIMESTAMP_REFRESH_SECONDS = 1.0
+
+_cached_timestamp = ""
+_timestamp_expires_at = 0.0
+
+_LEVEL_RE = re.compile(r"\blevel\s*(\d+)", re.IGNORECASE)
+
+# Control characters removed by sanitize_input (tab, newline and carriage return are kept)
+_CONTROL_CHARS = "".join(chr(code) for code in (*range(0x00, 0x20), 0x7f) if chr(code) not in "\t\n\r")
+_SANITIZE_TABLE = str.maketrans("", "", _CONTROL_CHARS)
+
+# Word groups for difficulty adjustment, matched as substrings of lowercased text
+_NEGATIVE_EMOTION_RE = re.compile("confused|struggling|anxious")
+_POSITIVE_EMOTION_RE = re.compile("focused|motivated|confident")
+_EASIER_CONTEXT_RE = re.compile("struggling|difficult|hard|confused")
+_HARDER_CONTEXT_RE = re.compile("advanced|expert|challenging")
+
 def setup_logging(level: str = "INFO") -> None:
     """Configure logging for the application."""
     logging.basicConfig(
@@ -16,6 +37,33 @@ def setup_logging(level: str = "INFO") -> None:
         datefmt='%Y-%m-%d %H:%M:%S'
     )
 
+def cached_timestamp() -> str:
+    """
+    Get the current time as an ISO-formatted string, regenerated at most once per second.
+    
+    Returns:
+        ISO-formatted local timestamp, at most TIMESTAMP_REFRESH_SECONDS old
+    """
+    global _cached_timestamp, _timestamp_expires_at
+    now = time.monotonic()
+    if now >= _timestamp_expires_at:
+        _cached_timestamp = datetime.now().isoformat()
+        _timestamp_expires_at = now + TIMESTAMP_REFRESH_SECONDS
+    return _cached_timestamp
+
+def parse_mastery_level(mastery_level: str) -> Optional[int]:
+    """
+    Extract the numeric level from a mastery description such as "Level 6: ...".
+    
+    Args:
+        mastery_level: Student's mastery level description
+        
+    Returns:
+        The level number, or None if the description has none
+    """
+    match = _LEVEL_RE.search(mastery_level)
+    return int(match.group(1)) if match else None
+
 def validate_parameters(parameters: Dict[str, Any], required_fields: List[str]) -> bool:
     """
     Validate that all required parameters are present.
@@ -27,10 +75,12 @@ def validate_parameters(parameters: Dict[str, Any], required_fields: List[str])
     Returns:
         True if all required fields are present, False otherwise
     """
-    missing_fields = [field for field in required_fields if field not in parameters]
+    # Set difference runs in C against the dict's keys; the common success path
+    # ends with an empty set and no per-field Python loop
+    missing_fields = set(required_fields).difference(parameters)
     
     if missing_fields:
-        logger.warning(f"Missing required fields: {missing_fields}")
+        logger.warning("Missing required fields: %s", sorted(missing_fields))
         return False
     
     return True
@@ -49,7 +99,7 @@ def format_error_response(error_message: str, error_code: str = "UNKNOWN_ERROR")
     return {
         "error": error_message,
         "error_code": error_code,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": cached_timestamp()
     }
 
 def sanitize_input(text: str, max_length: int = 1000) -> str:
@@ -66,14 +116,14 @@ def sanitize_input(text: str, max_length: int = 1000) -> str:
     if not text:
         return ""
     
+    # Remove potentially harmful characters in a single C-level pass
+    text = text.translate(_SANITIZE_TABLE)
+    
     # Truncate if too long
     if len(text) > max_length:
         text = text[:max_length] + "..."
     
-    # Remove potentially harmful characters
-    text = text.strip()
-    
-    return text
+    return text.strip()
 
 def extract_keywords(text: str, keyword_list: List[str]) -> List[str]:
     """
@@ -86,10 +136,33 @@ def extract_keywords(text: str, keyword_list: List[str]) -> List[str]:
     Returns:
         List of found keywords
     """
-    text_lower = text.lower()
-    found_keywords = [keyword for keyword in keyword_list if keyword in text_lower]
+    if not keyword_list:
+        return []
+    
+    pattern, implied = _keyword_matcher(tuple(keyword_list))
+    found = set()
+    for match in pattern.findall(text.lower()):
+        found.update(implied[match])
     
-    return found_keywords
+    return [keyword for keyword in keyword_list if keyword in found]
+
+@functools.lru_cache(maxsize=128)
+def _keyword_matcher(keywords: Tuple[str, ...]) -> Tuple[Pattern[str], Dict[str, Tuple[str, ...]]]:
+    """
+    Compile a keyword list into a single-pass substring matcher.
+    
+    The lookahead pattern yields the longest keyword starting at every position
+    of the text, so overlapping keywords are all seen in one scan. Any shorter
+    keyword starting at the same position is a prefix of that match, so each
+    match maps to every keyword it implies.
+    """
+    ordered = sorted(set(keywords), key=len, reverse=True)
+    pattern = re.compile("(?=(%s))" % "|".join(re.escape(keyword) for keyword in ordered))
+    implied = {
+        keyword: tuple(prefix for prefix in ordered if keyword.startswith(prefix))
+        for keyword in ordered
+    }
+    return pattern, implied
 
 def calculate_difficulty_score(mastery_level: str, emotional_state: str, message_context: str) -> str:
     """
@@ -104,26 +177,23 @@ def calculate_difficulty_score(mastery_level: str, emotional_state: str, message
         Difficulty level: "easy", "medium", or "hard"
     """
     # Extract mastery level number if present
-    mastery_score = 5  # Default medium
-    if "level" in mastery_level.lower():
-        try:
-            level_num = int(mastery_level.lower().split("level")[1].split()[0])
-            mastery_score = level_num
-        except (IndexError, ValueError):
-            pass
+    level = parse_mastery_level(mastery_level)
+    mastery_score = 5 if level is None else level  # Default medium
     
     # Emotional state adjustment
     emotional_adjustment = 0
-    if any(word in emotional_state.lower() for word in ["confused", "struggling", "anxious"]):
+    emotional_lower = emotional_state.lower()
+    if _NEGATIVE_EMOTION_RE.search(emotional_lower):
         emotional_adjustment = -2
-    elif any(word in emotional_state.lower() for word in ["focused", "motivated", "confident"]):
+    elif _POSITIVE_EMOTION_RE.search(emotional_lower):
         emotional_adjustment = 1
     
     # Message context adjustment
     context_adjustment = 0
-    if any(word in message_context.lower() for word in ["struggling", "difficult", "hard", "confused"]):
+    context_lower = message_context.lower()
+    if _EASIER_CONTEXT_RE.search(context_lower):
         context_adjustment = -2
-    elif any(word in message_context.lower() for word in ["advanced", "expert", "challenging"]):
+    elif _HARDER_CONTEXT_RE.search(context_lower):
         context_adjustment = 2
     
     # Calculate final score
@@ -152,7 +222,7 @@ def format_tool_response(tool_name: str, response_data: Dict[str, Any], success:
         "success": success,
         "tool_name": tool_name,
         "response_data": response_data,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": cached_timestamp()
     }
 
 def log_operation(operation: str, user_id: str, details: Dict[str, Any] = None) -> None:
@@ -164,13 +234,17 @@ def log_operation(operation: str, user_id: str, details: Dict[str, Any] = None)
         user_id: ID of the user performing the operation
         details: Additional details to log
     """
+    # Skip building the record entirely when INFO is filtered out
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    
     log_data = {
         "operation": operation,
         "user_id": user_id,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": cached_timestamp()
     }
     
     if details:
         log_data.update(details)
     
-    logger.info(f"Operation: {operation} for user {user_id}", extra=log_data)
+    logger.info("Operation: %s for user %s", operation, user_id, extra=log_data)